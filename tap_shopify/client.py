@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 from functools import cached_property
-from inspect import stack
 from typing import Any, Optional
 
+import requests
 from singer_sdk import typing as th
 from singer_sdk.pagination import SinglePagePaginator
 from singer_sdk.streams import GraphQLStream
@@ -17,18 +17,24 @@ from tap_shopify.paginator import ShopifyPaginator
 
 def verify_recursion(func):
     """Verify if the stream is recursive."""
-    objs = []
-
-    def wrapper(*args, **kwargs):
-        if not [f for f in stack() if f.function == func.__name__]:
-            objs.clear()
-        field_name = args[1]["name"]
-        field_kind = args[1]["kind"]
-        if field_name not in objs:
+    objs = set()
+    depth = [0]
+
+    def wrapper(self, field, *args, **kwargs):
+        depth[0] += 1
+        try:
+            # Reset the seen objects on the outermost call.
+            if depth[0] == 1:
+                objs.clear()
+            field_name = field["name"]
+            field_kind = field["kind"]
+            if field_name in objs:
+                return None
             if field_kind == "OBJECT":
-                objs.append(args[1]["name"])
-            result = func(*args, **kwargs)
-            return result
+                objs.add(field_name)
+            return func(self, field, *args, **kwargs)
+        finally:
+            depth[0] -= 1
 
     return wrapper
 
@@ -39,15 +45,17 @@ class ShopifyStream(GraphQLStream):
     query_name = None
     single_object_params = None
     ignore_objs = []
-    _requests_session = None
     nested_connections = []
 
     @property
     def url_base(self) -> str:
         """Return the API URL root, configurable via tap settings."""
-        store = self.config.get("store")
-        api_version = self.config.get("api_version")
-        return f"https://{store}.myshopify.com/admin/api/{api_version}/graphql.json"
+        return self._tap._url
+
+    @property
+    def requests_session(self) -> requests.Session:
+        """Return the session shared across the tap, reusing its connections."""
+        return self._tap._session
 
     @property
     def authenticator(self):
@@ -84,8 +92,8 @@ class ShopifyStream(GraphQLStream):
     @cached_property
     def additional_arguments(self) -> dict:
         """Return the schema for the stream."""
-        gql_query = next(q for q in self._tap.queries_gql if q["name"]==self.query_name)
-        if "includeClosed" in [a["name"] for a in gql_query["args"]]:
+        gql_query = self._tap.queries_gql_by_name[self.query_name]
+        if any(a["name"] == "includeClosed" for a in gql_query["args"]):
             return ["includeClosed: true"]
         return []
 
@@ -155,27 +163,14 @@ class ShopifyStream(GraphQLStream):
 
     def extract_gql_schema(self, gql_type):
         """Extract the schema for the stream."""
-        gql_type_lw = gql_type.lower()
-        schema_gen = (s for s in self.schema_gql if s["name"].lower() == gql_type_lw)
-        return next(schema_gen, None)
-
-    @cached_property
-    def catalog_dict(self):
-        """Return the catalog for the stream."""
-        if getattr(self._tap, "input_catalog"):
-            catalog = self._tap.input_catalog.to_dict()
-            return catalog["streams"]
-        return {}
+        return self._tap.schema_gql_by_name.get(gql_type.lower())
 
     @cached_property
     def schema(self) -> dict:
         """Return the schema for the stream."""
-        if getattr(self._tap, "input_catalog"):
-            streams = self.catalog_dict
-            stream = (s for s in streams if s["tap_stream_id"] == self.name)
-            stream_catalog = next(stream, None)
-            if stream_catalog:
-                return stream_catalog["schema"]
+        stream_catalog = self._tap._catalog_by_id.get(self.name)
+        if stream_catalog:
+            return stream_catalog["schema"]
 
         stream_type = self.extract_gql_schema(self.gql_type)
         properties = self.get_fields_schema(stream_type["fields"])
@@ -188,53 +183,48 @@ class ShopifyStream(GraphQLStream):
     @cached_property
     def selected_properties(self):
         """Return the selected properties from the schema."""
-        selected_properties = []
-        for key, value in self.metadata.items():
-            if isinstance(key, tuple) and len(key) == 2:
-                field_name = key[-1]
-                if (
-                    value.selected
-                    or value.selected_by_default
-                    or field_name in self.primary_keys
-                    or field_name == self.replication_key
-                ):
-                    selected_properties.append(field_name)
-        return selected_properties
+        always_selected = frozenset(self.primary_keys or []) | {self.replication_key}
+        return [
+            key[-1]
+            for key, value in self.metadata.items()
+            if isinstance(key, tuple)
+            and len(key) == 2
+            and (
+                value.selected
+                or value.selected_by_default
+                or key[-1] in always_selected
+            )
+        ]
 
-    @property
+    @cached_property
     def gql_selected_fields(self):
         """Return the selected fields for the stream."""
         schema = self.schema["properties"]
-        catalog = {k: v for k, v in schema.items() if k in self.selected_properties}
-
-        def find_parent_key(d, target_key, parent=None):
-            if target_key in d:
-                return parent
-            for key, value in d.items():
-                if isinstance(value, dict):
-                    result = find_parent_key(value, target_key, key)
-                    if result is not None:
-                        return result
-            return None
-
-        def denest_schema(schema):
-            output = ""
-            for key, value in schema.items():
-
-                if self.query_name == "orders" and key == "lineItems" and find_parent_key(schema, key) == None:
-                    # if query is for order line items we do not need to denest and create a query for it since 
-                    # we are doing this manually in line 239 below
+        selected_properties = set(self.selected_properties)
+        catalog = {k: v for k, v in schema.items() if k in selected_properties}
+
+        # Walk the schema with an explicit stack of items iterators instead of
+        # recursing, collecting the query fragments in a list.
+        parts = []
+        stack = [iter(catalog.items())]
+        while stack:
+            for key, value in stack[-1]:
+                if self.query_name == "orders" and key == "lineItems":
+                    # if query is for order line items we do not need to denest and create a query for it since
+                    # we are adding order_line_items_query manually below
                     continue
-                else:
-                    if "items" in value.keys():
-                        value = value["items"]
-                    if "properties" in value.keys():
-                        denested = denest_schema(value["properties"])
-                        output = f"{output}\n{key}\n{{{denested}\n}}"
-                    else:
-                        output = f"{output}\n{key}"
-            return output
-        selected_fields = denest_schema(catalog)
+                if "items" in value.keys():
+                    value = value["items"]
+                if "properties" in value.keys():
+                    parts.append(f"\n{key}\n{{")
+                    stack.append(iter(value["properties"].items()))
+                    break
+                parts.append(f"\n{key}")
+            else:
+                stack.pop()
+                if stack:
+                    parts.append("\n}")
+        selected_fields = "".join(parts)
 
         if self.query_name == "orders":
             # add lineItems query to orders
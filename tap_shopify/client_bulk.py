@@ -1,17 +1,26 @@
 """GraphQL client handling, including shopify-betaStream base class."""
 
-from datetime import datetime
-from time import sleep
+from functools import cached_property
+from time import monotonic, sleep
 from typing import Any, Iterable, Optional, cast
 
 import requests
 import simplejson
-from singer_sdk.helpers.jsonpath import extract_jsonpath
 from singer_sdk.pagination import SinglePagePaginator
 
 from tap_shopify.client import ShopifyStream
 from tap_shopify.exceptions import InvalidOperation, OperationFailed
-from tap_shopify.gql_queries import bulk_query, bulk_query_status, simple_query
+from tap_shopify.gql_queries import (
+    bulk_query,
+    bulk_query_status,
+    render_query,
+    simple_query,
+)
+
+# The status query never changes, so encode its request body once.
+bulk_query_status_payload = simplejson.dumps(
+    {"query": bulk_query_status, "variables": {}}
+).encode()
 
 
 class shopifyBulkStream(ShopifyStream):
@@ -25,22 +34,20 @@ class shopifyBulkStream(ShopifyStream):
         else:
             base_query = bulk_query
 
-        query = base_query.replace("__query_name__", self.query_name)
-        query = query.replace("__selected_fields__", self.gql_selected_fields)
-
         filters = self.filters
 
-        # No filters should also exclude the parens
-        if filters:
-            query = query.replace("__filters__", "(" + filters + ")")
-        else:
-            query = query.replace("__filters__", "")
-
-        return query
+        return render_query(
+            base_query,
+            query_name=self.query_name,
+            selected_fields=self.gql_selected_fields,
+            # No filters should also exclude the parens
+            filters=f"({filters})" if filters else "",
+        )
 
-    @property
+    @cached_property
     def filters(self):
         """Return a dictionary of values to be used in URL parameterization."""
+        # The starting timestamp is fixed for the whole run, so this is built once.
         filters = []
         if self.additional_arguments:
             filters.extend(self.additional_arguments)
@@ -64,7 +71,7 @@ class shopifyBulkStream(ShopifyStream):
                     method=self.rest_method,
                     url=self.get_url({}),
                     headers=headers,
-                    json=dict(query=bulk_query_status, variables={}),
+                    data=bulk_query_status_payload,
                 ),
             ),
         )
@@ -74,15 +81,12 @@ class shopifyBulkStream(ShopifyStream):
 
         return response
 
-    def check_status(self, operation_id, sleep_time=10, timeout=1800):
-        status_jsonpath = "$.data.currentBulkOperation"
-        start = datetime.now().timestamp()
+    def check_status(self, operation_id, sleep_time=2, max_sleep_time=30, timeout=1800):
+        deadline = monotonic() + timeout
 
-        while datetime.now().timestamp() < (start + timeout):
+        while monotonic() < deadline:
             status_response = self.get_operation_status()
-            status = next(
-                extract_jsonpath(status_jsonpath, input=status_response.json())
-            )
+            status = status_response.json()["data"]["currentBulkOperation"]
             self.logger.info("Poll status...")
             self.logger.info(status)
             if status["id"] != operation_id:
@@ -105,24 +109,27 @@ class shopifyBulkStream(ShopifyStream):
                     return None
                 raise InvalidOperation(f"Job failed: {status['errorCode']}, {status}")
             sleep(sleep_time)
+            # Back off so long running jobs are polled less often.
+            sleep_time = min(sleep_time * 1.5, max_sleep_time)
         raise OperationFailed("Job Timeout")
 
     def parse_response(self, response: requests.Response) -> Iterable[dict]:
         """Parse the response and return an iterator of result rows."""
-        operation_id_jsonpath = "$.data.bulkOperationRunQuery.bulkOperation.id"
         request_response = response.json()
 
         self.logger.info(f"Request response: {request_response}")
 
-        operation_id = next(
-            extract_jsonpath(operation_id_jsonpath, input=request_response)
-        )
+        bulk_operation = request_response["data"]["bulkOperationRunQuery"]["bulkOperation"]
+        operation_id = bulk_operation["id"]
 
         url = self.check_status(operation_id)
         if not url:
             return []
 
-        output = requests.get(url, stream=True)
-
-        for line in output.iter_lines():
-            yield simplejson.loads(line)
+        # Stream the JSONL export in large chunks and parse the raw byte lines.
+        with requests.Session() as session:
+            output = session.get(url, stream=True)
+            output.raise_for_status()
+            for line in output.iter_lines(chunk_size=1 << 20, decode_unicode=False):
+                if line:
+                    yield simplejson.loads(line)
@@ -5,10 +5,10 @@ from __future__ import annotations
 from typing import Any, Dict, Iterable, Optional
 
 import requests  # noqa: TCH002
-from singer_sdk.helpers.jsonpath import extract_jsonpath
 
 from tap_shopify.client import ShopifyStream
-from tap_shopify.gql_queries import query_incremental
+from tap_shopify.gql_queries import query_incremental, render_query
+from tap_shopify.utils import decode_response
 
 
 class shopifyGqlStream(ShopifyStream):
@@ -27,12 +27,14 @@ class shopifyGqlStream(ShopifyStream):
 
         base_query = query_incremental
 
-        query = base_query.replace("__query_name__", self.query_name)
-        query = query.replace("__selected_fields__", self.gql_selected_fields)
         additional_args = ", " + ", ".join(self.additional_arguments)
-        query = query.replace("__additional_args__", additional_args)
 
-        return query
+        return render_query(
+            base_query,
+            query_name=self.query_name,
+            selected_fields=self.gql_selected_fields,
+            additional_args=additional_args,
+        )
 
     def get_url_params(
         self, context: Optional[dict], next_page_token: Optional[Any]
@@ -58,31 +60,31 @@ class shopifyGqlStream(ShopifyStream):
     ) -> Optional[dict]:
         """Prepare the data payload for the GraphQL API request."""
         params = self.get_url_params(context, next_page_token)
-        query = self.query.lstrip()
+        # The query is cached on the stream, only params change between pages.
+        query = self.query
         request_data = {
             "query": query,
             "variables": params,
         }
         self.saved_context = context
-        self.logger.debug(f"Attempting query:\n{query}, with params {params}, with context {context}, and next_page_token {next_page_token}")
+        self.logger.debug(
+            "Attempting query:\n%s, with params %s, with context %s, and next_page_token %s",
+            query,
+            params,
+            context,
+            next_page_token,
+        )
         return request_data
     
     def ignore_path(self, path):
         self.schema = delete_schema_item(self.schema, path[-1])
-        # Delete the attribute so we regen the query.
+        # Delete the cached attributes so we regen the query.
+        del self.gql_selected_fields
         del self.query
 
     def parse_response(self, response: requests.Response) -> Iterable[dict]:
         """Parse the response and return an iterator of result rows."""
-        # if self.replication_key:
-        #     json_path = f"$.data.{self.query_name}.edges[*].node"
-        # else:
-        #     json_path = f"$.data.{self.query_name}"
-        
-        # Not sure why replication_key matters here. The data is still stored under node
-        # See locations stream.
-        json_path = f"$.data.{self.query_name}.edges[*].node"
-        response = response.json()
+        response = decode_response(response)
 
         errors = response.get("errors")
         if errors:
@@ -119,17 +121,19 @@ class shopifyGqlStream(ShopifyStream):
                 else:
                     raise Exception(response["errors"])
 
-        yield from extract_jsonpath(json_path, input=response)
+        # Records are always stored under edges[*].node, see locations stream.
+        data = (response.get("data") or {}).get(self.query_name) or {}
+        for edge in data.get("edges") or []:
+            yield edge["node"]
 
 
 def delete_schema_item(d, target_key):
-    if not isinstance(d, dict):
-        return d
-    if target_key in d:
-        del d[target_key]
-    for key in d:
-        if key == 'required' and target_key in d[key]:
-            d[key].remove(target_key)
-        else:
-            d[key] = delete_schema_item(d[key], target_key)
+    stack = [d]
+    while stack:
+        node = stack.pop()
+        node.pop(target_key, None)
+        required = node.get("required")
+        if isinstance(required, list) and target_key in required:
+            required.remove(target_key)
+        stack.extend(v for v in node.values() if isinstance(v, dict))
     return d
@@ -1,5 +1,17 @@
 """GraphQL queries for Shopify API."""
 
+import re
+
+placeholder_pattern = re.compile(
+    r"__(query_name|selected_fields|additional_args|filters)__"
+)
+
+
+def render_query(template: str, **values: str) -> str:
+    """Fill the __placeholder__ markers of a query template in a single pass."""
+    return placeholder_pattern.sub(lambda m: values[m.group(1)], template)
+
+
 simple_query = """query {
     __query_name__ {
         __selected_fields__
@@ -5,9 +5,10 @@ from time import sleep
 
 import requests
 from requests import Response
-from singer_sdk.helpers.jsonpath import extract_jsonpath
 from singer_sdk.pagination import BaseAPIPaginator
 
+from tap_shopify.utils import decode_response
+
 
 class ShopifyPaginator(BaseAPIPaginator):
     """shopify paginator class."""
@@ -46,11 +47,10 @@ class ShopifyPaginator(BaseAPIPaginator):
             self._logger.info(f"Sleeping for {sleep_time} seconds to restore points. {self._available_points} points left, restoring to {min_leftover_points}")
             sleep(sleep_time)
 
-        # Send one max query.
-        est_per_query_cost = self._query_cost / self._page_size
-        new_page_size = self._single_query_max_cost_limt / est_per_query_cost
-        self._page_size = 250 if new_page_size > 250 else int(new_page_size)
-        self._logger.debug(f"Next page size {self._page_size}")
+        # Send one max query, sized from the cost of the last page.
+        new_page_size = self._single_query_max_cost_limt * self._page_size // self._query_cost
+        self._page_size = min(new_page_size, 250)
+        self._logger.debug("Next page size %s", self._page_size)
         return self._page_size
 
     def query_name(self, response_json) -> str:
@@ -63,7 +63,7 @@ class ShopifyPaginator(BaseAPIPaginator):
 
     def get_next(self, response: requests.Response):
         """Get the next pagination value."""
-        response_json = response.json()
+        response_json = decode_response(response)
 
         # Request failed. No next page.
         # Some requests may fail, like for an bad endpoint / schema.
@@ -80,13 +80,10 @@ class ShopifyPaginator(BaseAPIPaginator):
         self._restore_rate = cost["throttleStatus"].get("restoreRate")
         self._max_points = cost["throttleStatus"].get("maximumAvailable")
 
-        has_next_json_path = f"$.data.{query_name}.pageInfo.hasNextPage"
-        has_next = next(extract_jsonpath(has_next_json_path, response_json))
+        page_info = response_json["data"][query_name]["pageInfo"]
 
-        if has_next:
-            cursor_json_path = f"$.data.{query_name}.pageInfo.endCursor"
-            all_matches = extract_jsonpath(cursor_json_path, response_json)
-            return next(all_matches, None)
+        if page_info["hasNextPage"]:
+            return page_info.get("endCursor")
 
         return None
 
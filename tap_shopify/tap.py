@@ -4,16 +4,20 @@ from __future__ import annotations
 
 from singer_sdk import Tap
 from singer_sdk import typing as th
-from functools import cached_property
+from functools import cached_property, lru_cache
 from tap_shopify.gql_queries import schema_query, queries_query
 from typing import Any, Iterable
 
 import requests
 import inflection
+from requests.adapters import HTTPAdapter
 
 from tap_shopify.client_bulk import shopifyBulkStream
 from tap_shopify.client_gql import shopifyGqlStream
 
+# Stream names are derived from the same query names on every discovery.
+underscore = lru_cache(maxsize=None)(inflection.underscore)
+
 
 class ShopifyStream(shopifyGqlStream, shopifyBulkStream):
     """Define base based on the type GraphQL or Bulk."""
@@ -27,11 +31,15 @@ class ShopifyStream(shopifyGqlStream, shopifyBulkStream):
 
     @cached_property
     def query(self) -> str:
-        """Set or return the GraphQL query string."""
+        """Set or return the GraphQL query string.
+
+        Built once and reused for every page, ignore_path deletes it when the
+        schema is pruned so it is rebuilt on the next request.
+        """
         if self.config.get("bulk"):
-            return shopifyBulkStream.query(self)
+            return shopifyBulkStream.query(self).lstrip()
         else:
-            return shopifyGqlStream.query(self)
+            return shopifyGqlStream.query(self).lstrip()
 
 
 class TapShopify(Tap):
@@ -39,7 +47,7 @@ class TapShopify(Tap):
 
     name = "tap-shopify"
 
-    gql_types_in_schema = []
+    gql_types_in_schema: set[str] = set()
 
     config_jsonschema = th.PropertiesList(
         th.Property(
@@ -86,23 +94,31 @@ class TapShopify(Tap):
         ),
     ).to_dict()
 
-    def request_gql(self, query: str) -> requests.Response:
-        """Make a request to the GraphQL endpoint and return the response."""
-        headers = {
-            "Content-Type": "application/json",
-            "X-Shopify-Access-Token": self.config["access_token"],
-        }
+    @cached_property
+    def _url(self) -> str:
+        """Return the GraphQL endpoint for the configured store."""
         store = self.config["store"]
         api_version = self.config["api_version"]
-        url = f"https://{store}.myshopify.com/admin/api/{api_version}/graphql.json"
+        return f"https://{store}.myshopify.com/admin/api/{api_version}/graphql.json"
 
+    @cached_property
+    def _session(self) -> requests.Session:
+        """Return a keep-alive session shared by the tap and its streams."""
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+        session.headers.update(
+            {
+                "Content-Type": "application/json",
+                "X-Shopify-Access-Token": self.config["access_token"],
+            }
+        )
+        return session
+
+    def request_gql(self, query: str) -> requests.Response:
+        """Make a request to the GraphQL endpoint and return the response."""
         request_data = {"query": query}
 
-        resp = requests.post(
-            url=url,
-            headers=headers,
-            json=request_data,
-        )
+        resp = self._session.post(url=self._url, json=request_data)
 
         resp.raise_for_status()
 
@@ -114,8 +130,21 @@ class TapShopify(Tap):
         resp = self.request_gql(schema_query)
         return resp.json()["data"]["__schema"]["types"]
 
+    @cached_property
+    def schema_gql_by_name(self) -> dict:
+        """Return the schema types indexed by their lowercased name."""
+        return {s["name"].lower(): s for s in self.schema_gql}
+
+    @cached_property
+    def _catalog_by_id(self) -> dict:
+        """Return the input catalog streams indexed by their tap_stream_id."""
+        if self.input_catalog:
+            streams = self.input_catalog.to_dict()["streams"]
+            return {s["tap_stream_id"]: s for s in streams}
+        return {}
+
     def filter_queries(self, query):
-        args = [a["name"] for a in query["args"]]
+        args = {a["name"] for a in query["args"]}
         return "first" in args and "query" in args
 
     @cached_property
@@ -127,6 +156,11 @@ class TapShopify(Tap):
         queries = jresp["data"]["__schema"]["queryType"]["fields"]
         return [q for q in queries if self.filter_queries(q)]
 
+    @cached_property
+    def queries_gql_by_name(self) -> dict:
+        """Return the queries indexed by their name."""
+        return {q["name"]: q for q in self.queries_gql}
+
     def extract_gql_node(self, query: dict) -> dict:
         query_fields = query["type"]["ofType"]["fields"]
         return next((f for f in query_fields if f["name"] == "nodes"), None)
@@ -135,7 +169,7 @@ class TapShopify(Tap):
         return node["type"]["ofType"]["ofType"]["ofType"]["name"]
 
     def get_type_fields(self, gql_type: str) -> list[dict]:
-        type_def = next(s for s in self.schema_gql if s["name"] == gql_type)
+        type_def = self.schema_gql_by_name[gql_type.lower()]
 
         filtered_fields = [
             f
@@ -165,6 +199,7 @@ class TapShopify(Tap):
             "processedAt",
         ]
 
+        append_streams = set(self.config.get("append_streams", []))
         streams = []
 
         for query in queries:
@@ -174,27 +209,22 @@ class TapShopify(Tap):
 
             gql_type = self.get_gql_query_type(node)
             fields_def = self.get_type_fields(gql_type)
-            append_streams = self.config.get("append_streams", [])
-            stream_name = inflection.underscore(query["name"])
-
-            # Get the primary key
-            pk = [
-                k
-                for k, v in fields_def.items()
-                if v["name"] == "ID" and stream_name not in append_streams
-            ]
-            if not pk and stream_name not in append_streams:
-                continue
-
-            # Get the replication key
-            date_fields = [k for k, v in fields_def.items() if v["name"] == "DateTime"]
+            stream_name = underscore(query["name"])
 
             if stream_name in append_streams:
+                pk = []
                 rk = None
             else:
+                # Get the primary key
+                pk = [k for k, v in fields_def.items() if v["name"] == "ID"]
+                if not pk:
+                    continue
+
+                # Get the replication key
+                date_fields = {k for k, v in fields_def.items() if v["name"] == "DateTime"}
                 rk = next((i for i in incremental_fields if i in date_fields), None)
 
-            self.gql_types_in_schema.append(gql_type)
+            self.gql_types_in_schema.add(gql_type)
 
             type_def = dict(
                 name=stream_name,
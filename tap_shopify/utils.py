@@ -0,0 +1,20 @@
+"""Shared helpers for tap-shopify."""
+
+import requests
+
+
+def decode_response(response: requests.Response) -> dict:
+    """Return the decoded JSON body, decoding it only once per response.
+
+    Both the stream and the paginator read every page, so the parsed body is
+    stored on the response for whichever of them comes second.
+
+    The returned dict is shared and must be treated as read-only. In
+    particular parse_response must not mutate it, since the paginator reads
+    the same pageInfo and extensions after the records have been yielded.
+    """
+    decoded = getattr(response, "_decoded_json", None)
+    if decoded is None:
+        decoded = response.json()
+        response._decoded_json = decoded
+    return decoded
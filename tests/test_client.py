@@ -0,0 +1,137 @@
+"""Tests for the schema helpers used to build the stream queries."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from tap_shopify.client import ShopifyStream, verify_recursion
+from tap_shopify.client_gql import delete_schema_item
+from tap_shopify.gql_queries import order_line_items_query
+
+NESTED_SCHEMA = {
+    "id": {"type": ["string"]},
+    "name": {"type": ["string", "null"]},
+    "customer": {
+        "type": ["object", "null"],
+        "properties": {
+            "id": {"type": ["string"]},
+            "addresses": {
+                "type": ["array", "null"],
+                "items": {
+                    "type": ["object"],
+                    "properties": {
+                        "city": {"type": ["string", "null"]},
+                        "lineItems": {"type": ["object", "null"]},
+                    },
+                },
+            },
+            "tags": {"type": ["array", "null"], "items": {"type": ["string"]}},
+        },
+    },
+    "lineItems": {"type": ["object", "null"]},
+    "updatedAt": {"type": ["string", "null"], "format": "date-time"},
+    "unselected": {"type": ["string", "null"]},
+}
+
+
+def denest_reference(schema, query_name):
+    """Recursive denest the iterative walk in gql_selected_fields replaced."""
+    output = ""
+    for key, value in schema.items():
+        if query_name == "orders" and key == "lineItems":
+            continue
+        if "items" in value.keys():
+            value = value["items"]
+        if "properties" in value.keys():
+            denested = denest_reference(value["properties"], query_name)
+            output = f"{output}\n{key}\n{{{denested}\n}}"
+        else:
+            output = f"{output}\n{key}"
+    return output
+
+
+def selected_fields(query_name):
+    stream = SimpleNamespace(
+        schema={"properties": NESTED_SCHEMA},
+        selected_properties=[k for k in NESTED_SCHEMA if k != "unselected"],
+        query_name=query_name,
+    )
+    return ShopifyStream.gql_selected_fields.func(stream)
+
+
+def test_gql_selected_fields_matches_recursive_denest():
+    catalog = {k: v for k, v in NESTED_SCHEMA.items() if k != "unselected"}
+    assert selected_fields("customers") == denest_reference(catalog, "customers")
+
+
+def test_gql_selected_fields_skips_line_items_for_orders():
+    catalog = {k: v for k, v in NESTED_SCHEMA.items() if k != "unselected"}
+    fields = selected_fields("orders")
+
+    assert fields == denest_reference(catalog, "orders") + order_line_items_query
+    # lineItems only appears through the hand written query, at any depth.
+    assert fields.count("lineItems") == 1
+    assert "\ncity\n}" in fields
+
+
+def test_delete_schema_item_prunes_properties_and_required():
+    schema = {
+        "type": "object",
+        "properties": {
+            "secret": {"type": ["string"]},
+            "customer": {
+                "type": "object",
+                "properties": {
+                    "secret": {"type": ["string"]},
+                    "email": {"type": ["string"]},
+                },
+                "required": ["secret", "email"],
+            },
+        },
+        "required": ["secret"],
+    }
+
+    result = delete_schema_item(schema, "secret")
+
+    assert result is schema
+    assert schema == {
+        "type": "object",
+        "properties": {
+            "customer": {
+                "type": "object",
+                "properties": {"email": {"type": ["string"]}},
+                "required": ["email"],
+            },
+        },
+        "required": [],
+    }
+
+
+@verify_recursion
+def walk(_, field):
+    if field.get("fail"):
+        raise ValueError(field["name"])
+    return [walk(_, child) for child in field.get("children", [])]
+
+
+def test_verify_recursion_stops_on_repeated_objects():
+    node = {"name": "Node", "kind": "OBJECT", "children": []}
+    node["children"].append(node)
+    scalar = {"name": "String", "kind": "SCALAR"}
+    node["children"].extend([scalar, scalar])
+
+    # The nested Node is skipped, scalars are never remembered.
+    assert walk(None, node) == [None, [], []]
+    # The seen objects are reset on each outermost call.
+    assert walk(None, node) == [None, [], []]
+
+
+def test_verify_recursion_resets_after_errors():
+    failing = {"name": "Broken", "kind": "OBJECT", "fail": True}
+    parent = {"name": "Parent", "kind": "OBJECT", "children": [failing]}
+
+    with pytest.raises(ValueError):
+        walk(None, parent)
+
+    # The depth unwound, so the next call starts from a clean state.
+    assert walk(None, {"name": "Parent", "kind": "OBJECT"}) == []
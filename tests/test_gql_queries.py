@@ -0,0 +1,35 @@
+"""Tests for the GraphQL query templates."""
+
+from tap_shopify.gql_queries import bulk_query, query_incremental, render_query
+
+
+def test_render_query_fills_adjacent_placeholders():
+    query = render_query(
+        bulk_query,
+        query_name="orders",
+        selected_fields="\nid",
+        filters='(query: "updated_at:>2023-01-01T00:00:00")',
+    )
+
+    assert 'orders(query: "updated_at:>2023-01-01T00:00:00") {' in query
+    assert "__" not in query
+
+
+def test_render_query_without_filters():
+    query = render_query(
+        bulk_query, query_name="orders", selected_fields="\nid", filters=""
+    )
+
+    assert "orders {" in query
+
+
+def test_render_query_does_not_rescan_values():
+    query = render_query(
+        query_incremental,
+        query_name="orders",
+        selected_fields="__filters__",
+        additional_args=", includeClosed: true",
+    )
+
+    assert "query: $filter, includeClosed: true)" in query
+    assert "__filters__" in query